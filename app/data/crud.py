@@ -1,6 +1,6 @@
 import sqlite3
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Union
 
 from app.data.database import get_db_connection
 from app.utils.logger import get_logger
@@ -11,6 +11,53 @@ from app.data.models import (
 
 logger = get_logger(__name__)
 
+# A CRUD target, passed as the db_path argument of every CRUD function: a database path (a connection
+# is opened and closed per call) or an open connection from get_db_connection/db_session. A borrowed
+# connection must have foreign keys enabled, since deletes rely on ON DELETE CASCADE; see _connect.
+DbTarget = Union[str, sqlite3.Connection]
+
+class _BorrowedConnection:
+    """Caller-owned connection used for a single CRUD call.
+
+    commit/rollback act on a savepoint covering just this call, so the work nests inside any
+    transaction the caller already has open (and is committed if there is none). close() leaves
+    the caller's connection open.
+    """
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._open = True
+        conn.execute("SAVEPOINT crud_call")
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def commit(self):
+        if self._open:
+            self._conn.execute("RELEASE crud_call")
+            self._open = False
+
+    def rollback(self):
+        if self._open:
+            self._conn.execute("ROLLBACK TO crud_call")
+            self._conn.execute("RELEASE crud_call")
+            self._open = False
+
+    def close(self):
+        # Like closing a real connection, anything not committed is discarded
+        self.rollback()
+
+def _connect(db_path: DbTarget):
+    """Returns the connection for one CRUD call: a new one for a path, or the borrowed open connection.
+    Returns None (treated like a failed connection) for a borrowed connection without foreign keys enabled,
+    e.g. a plain sqlite3.connect() one, because cascading deletes would silently leave orphaned rows.
+    """
+    if isinstance(db_path, sqlite3.Connection):
+        if not db_path.execute("PRAGMA foreign_keys").fetchone()[0]:
+            logger.error("Borrowed connection has foreign keys disabled; open it with get_db_connection or db_session.")
+            return None
+        return _BorrowedConnection(db_path)
+    return get_db_connection(db_path)
+
 # --- Helper timestamp function ---
 def get_current_utc_timestamp() -> str:
     """Generate a UTC timestamp string in the same format as the database default.
@@ -103,7 +150,7 @@ def _user_setting_to_dict(user_setting: UserSetting) -> dict:
 
 # --- CRUD for Resource ---
 def create_resource(
-    db_path: str, 
+    db_path: DbTarget, 
     name: str, 
     description: Optional[str] = None, 
     rarity: Optional[str] = None, 
@@ -113,7 +160,7 @@ def create_resource(
     discovered: int = 0
 ) -> Optional[Resource]:
     logger.info(f"Attempting to create resource with name: {name}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         logger.error("Failed to create database connection.")
         return None
@@ -141,9 +188,45 @@ def create_resource(
         if conn:
             conn.close()
 
-def get_resource_by_id(db_path: str, resource_id: int) -> Optional[Resource]:
+def create_resources_bulk(db_path: DbTarget, resources: List[Resource]) -> List[Resource]:
+    """Creates several resources in one transaction, reading each new id back with INSERT ... RETURNING.
+    Any id/created_at/updated_at set on the input models is ignored.
+    Returns the created resources (with ids) in input order, or an empty list if any insert
+    fails (e.g. a duplicate name), in which case nothing is written.
+    """
+    logger.info(f"Attempting to bulk-create {len(resources)} resources")
+    if not resources:
+        return []
+    conn = _connect(db_path)
+    if conn is None:
+        logger.error("Failed to create database connection.")
+        return []
+    try:
+        cursor = conn.cursor()
+        current_time = get_current_utc_timestamp()
+        ids = [
+            cursor.execute(
+                '''INSERT INTO resource (name, description, rarity, category, source_locations, icon_path, discovered, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING id''',
+                (r.name, r.description, r.rarity, r.category, r.source_locations, r.icon_path, r.discovered, current_time, current_time)
+            ).fetchone()[0]
+            for r in resources
+        ]
+        conn.commit()
+        logger.info(f"Bulk-created {len(resources)} resources")
+        return [Resource(id=resource_id, name=r.name, description=r.description, rarity=r.rarity, category=r.category, source_locations=r.source_locations, icon_path=r.icon_path, discovered=r.discovered, created_at=current_time, updated_at=current_time)
+                for resource_id, r in zip(ids, resources)]
+    except sqlite3.Error as e:
+        logger.error(f"Error bulk-creating resources: {e}")
+        conn.rollback()
+        return []
+    finally:
+        if conn:
+            conn.close()
+
+def get_resource_by_id(db_path: DbTarget, resource_id: int) -> Optional[Resource]:
     logger.debug(f"Fetching resource with ID: {resource_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -160,9 +243,9 @@ def get_resource_by_id(db_path: str, resource_id: int) -> Optional[Resource]:
         if conn:
             conn.close()
 
-def get_resource_by_name(db_path: str, name: str) -> Optional[Resource]:
+def get_resource_by_name(db_path: DbTarget, name: str) -> Optional[Resource]:
     logger.debug(f"Fetching resource with name: {name}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -179,9 +262,9 @@ def get_resource_by_name(db_path: str, name: str) -> Optional[Resource]:
         if conn:
             conn.close()
 
-def get_all_resources(db_path: str) -> List[Resource]:
+def get_all_resources(db_path: DbTarget) -> List[Resource]:
     logger.debug("Fetching all resources")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return []
     try:
@@ -197,7 +280,7 @@ def get_all_resources(db_path: str) -> List[Resource]:
             conn.close()
 
 def update_resource(
-    db_path: str, 
+    db_path: DbTarget, 
     resource_id: int, 
     name: Optional[str] = None,
     description: Optional[str] = None, 
@@ -208,7 +291,7 @@ def update_resource(
     discovered: Optional[int] = None
 ) -> Optional[Resource]:
     logger.info(f"Attempting to update resource with ID: {resource_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     
@@ -222,6 +305,7 @@ def update_resource(
             existing_resource = get_resource_by_name(db_path, name) # Same here
             if existing_resource and existing_resource.id != resource_id:
                 logger.warning(f"Cannot update resource ID {resource_id}: another resource with name '{name}' already exists (ID: {existing_resource.id}).")
+                conn.close()
                 return None # Or handle as an error / return current state
         fields_to_update.append("name = ?")
         params.append(name)
@@ -278,9 +362,9 @@ def update_resource(
         if conn:
             conn.close()
 
-def delete_resource(db_path: str, resource_id: int) -> bool:
+def delete_resource(db_path: DbTarget, resource_id: int) -> bool:
     logger.info(f"Attempting to delete resource with ID: {resource_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return False
     try:
@@ -300,8 +384,26 @@ def delete_resource(db_path: str, resource_id: int) -> bool:
             conn.close()
 
 # --- CRUD for CraftingRecipe ---
+def _ingredients_query(load_resource_name: bool) -> str:
+    """Build the ingredient SELECT for a recipe.
+
+    The JOIN against resource is only needed to fill RecipeIngredient.resource_name;
+    callers that only care about resource_id/quantity can skip it.
+    """
+    if load_resource_name:
+        return (
+            "SELECT ri.id, ri.recipe_id, ri.resource_id, ri.quantity, r.name "
+            "FROM recipe_ingredient ri JOIN resource r ON ri.resource_id = r.id "
+            "WHERE ri.recipe_id = ?"
+        )
+    return (
+        "SELECT ri.id, ri.recipe_id, ri.resource_id, ri.quantity, NULL "
+        "FROM recipe_ingredient ri "
+        "WHERE ri.recipe_id = ?"
+    )
+
 def create_crafting_recipe(
-    db_path: str,
+    db_path: DbTarget,
     name: str,
     output_item_name: str,
     output_quantity: int = 1,
@@ -314,7 +416,7 @@ def create_crafting_recipe(
     ingredients: Optional[List[RecipeIngredient]] = None # List of RecipeIngredient data (not necessarily model instances yet)
 ) -> Optional[CraftingRecipe]:
     logger.info(f"Attempting to create crafting recipe: {name}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         logger.error("Failed to get DB connection for creating crafting recipe.")
         return None
@@ -340,26 +442,18 @@ def create_crafting_recipe(
             logger.error("Failed to get lastrowid for new crafting recipe.")
             return None
 
-        # Handle ingredients
-        recipe_ingredients_models = []
-        if ingredients:
-            for ing_data in ingredients:
-                # Assuming ing_data contains resource_id and quantity
-                # We don't create RecipeIngredient model instances here directly for insertion
-                # as the table schema is simple.
-                cursor.execute(
-                    "INSERT INTO recipe_ingredient (recipe_id, resource_id, quantity) VALUES (?, ?, ?)",
-                    (recipe_id, ing_data.resource_id, ing_data.quantity)
-                )
-                # For returning the full CraftingRecipe object, we can create the model instances
-                recipe_ingredients_models.append(
-                    RecipeIngredient(
-                        recipe_id=recipe_id, 
-                        resource_id=ing_data.resource_id, 
-                        quantity=ing_data.quantity
-                        # resource_name will be populated by the get methods
-                    )
-                )
+        # Handle ingredients: one executemany for all rows
+        # For returning the full CraftingRecipe object, we create the model instances;
+        # resource_name will be populated by the get methods
+        recipe_ingredients_models = [
+            RecipeIngredient(recipe_id=recipe_id, resource_id=ing_data.resource_id, quantity=ing_data.quantity)
+            for ing_data in ingredients or []
+        ]
+        if recipe_ingredients_models:
+            cursor.executemany(
+                "INSERT INTO recipe_ingredient (recipe_id, resource_id, quantity) VALUES (?, ?, ?)",
+                [(recipe_id, ing.resource_id, ing.quantity) for ing in recipe_ingredients_models]
+            )
         
         conn.commit()
         logger.info(f"Crafting recipe '{name}' created with ID: {recipe_id}")
@@ -379,9 +473,9 @@ def create_crafting_recipe(
         if conn:
             conn.close()
 
-def get_crafting_recipe_by_id(db_path: str, recipe_id: int) -> Optional[CraftingRecipe]:
+def get_crafting_recipe_by_id(db_path: DbTarget, recipe_id: int, *, load_resource_name: bool = True) -> Optional[CraftingRecipe]:
     logger.debug(f"Fetching crafting recipe with ID: {recipe_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
     try:
@@ -396,11 +490,7 @@ def get_crafting_recipe_by_id(db_path: str, recipe_id: int) -> Optional[Crafting
             return None
 
         # Fetch ingredients
-        cursor.execute(
-            "SELECT ri.id, ri.recipe_id, ri.resource_id, ri.quantity, r.name "
-            "FROM recipe_ingredient ri JOIN resource r ON ri.resource_id = r.id "
-            "WHERE ri.recipe_id = ?", (recipe_id,)
-        )
+        cursor.execute(_ingredients_query(load_resource_name), (recipe_id,))
         ingredients_rows = cursor.fetchall()
         ingredients_list = [
             RecipeIngredient(id=ing_row[0], recipe_id=ing_row[1], resource_id=ing_row[2], quantity=ing_row[3], resource_name=ing_row[4])
@@ -420,9 +510,9 @@ def get_crafting_recipe_by_id(db_path: str, recipe_id: int) -> Optional[Crafting
         if conn:
             conn.close()
 
-def get_crafting_recipe_by_name(db_path: str, name: str) -> Optional[CraftingRecipe]:
+def get_crafting_recipe_by_name(db_path: DbTarget, name: str) -> Optional[CraftingRecipe]:
     logger.debug(f"Fetching crafting recipe with name: {name}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
     try:
@@ -443,9 +533,9 @@ def get_crafting_recipe_by_name(db_path: str, name: str) -> Optional[CraftingRec
             conn.close()
 
 
-def get_all_crafting_recipes(db_path: str) -> List[CraftingRecipe]:
+def get_all_crafting_recipes(db_path: DbTarget, *, load_resource_name: bool = True) -> List[CraftingRecipe]:
     logger.debug("Fetching all crafting recipes")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return []
     recipes_list = []
@@ -461,11 +551,7 @@ def get_all_crafting_recipes(db_path: str) -> List[CraftingRecipe]:
         for row in recipe_rows:
             recipe_id = row[0]
             # Fetch ingredients for each recipe
-            cursor.execute(
-                "SELECT ri.id, ri.recipe_id, ri.resource_id, ri.quantity, r.name "
-                "FROM recipe_ingredient ri JOIN resource r ON ri.resource_id = r.id "
-                "WHERE ri.recipe_id = ?", (recipe_id,)
-            )
+            cursor.execute(_ingredients_query(load_resource_name), (recipe_id,))
             ingredients_rows = cursor.fetchall()
             ingredients_list = [
                 RecipeIngredient(id=ing_row[0], recipe_id=ing_row[1], resource_id=ing_row[2], quantity=ing_row[3], resource_name=ing_row[4])
@@ -486,7 +572,7 @@ def get_all_crafting_recipes(db_path: str) -> List[CraftingRecipe]:
             conn.close()
 
 def update_crafting_recipe(
-    db_path: str,
+    db_path: DbTarget,
     recipe_id: int,
     name: Optional[str] = None,
     output_item_name: Optional[str] = None,
@@ -500,7 +586,7 @@ def update_crafting_recipe(
     ingredients: Optional[List[RecipeIngredient]] = None # Pass full new list of ingredients
 ) -> Optional[CraftingRecipe]:
     logger.info(f"Attempting to update crafting recipe ID: {recipe_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
 
@@ -514,6 +600,7 @@ def update_crafting_recipe(
             existing_recipe = get_crafting_recipe_by_name(db_path, name) # Opens new connection
             if existing_recipe and existing_recipe.id != recipe_id:
                 logger.warning(f"Cannot update recipe ID {recipe_id}: another recipe with name '{name}' already exists (ID: {existing_recipe.id}).")
+                conn.close()
                 return None
         fields_to_update.append("name = ?")
         params.append(name)
@@ -565,11 +652,11 @@ def update_crafting_recipe(
         # This is a common strategy. More complex diffing is possible but adds complexity.
         if ingredients is not None: # If ingredients list is provided (even if empty)
             cursor.execute("DELETE FROM recipe_ingredient WHERE recipe_id = ?", (recipe_id,))
-            for ing_data in ingredients:
-                cursor.execute(
-                    "INSERT INTO recipe_ingredient (recipe_id, resource_id, quantity) VALUES (?, ?, ?)",
-                    (recipe_id, ing_data.resource_id, ing_data.quantity)
-                )            # If only ingredients were updated, ensure updated_at is also set for the main recipe
+            cursor.executemany(
+                "INSERT INTO recipe_ingredient (recipe_id, resource_id, quantity) VALUES (?, ?, ?)",
+                [(recipe_id, ing_data.resource_id, ing_data.quantity) for ing_data in ingredients]
+            )
+            # If only ingredients were updated, ensure updated_at is also set for the main recipe
             if not fields_to_update:
                  cursor.execute("UPDATE crafting_recipe SET updated_at = ? WHERE id = ?", (get_current_utc_timestamp(), recipe_id))
 
@@ -589,9 +676,9 @@ def update_crafting_recipe(
         if conn:
             conn.close()
 
-def delete_crafting_recipe(db_path: str, recipe_id: int) -> bool:
+def delete_crafting_recipe(db_path: DbTarget, recipe_id: int) -> bool:
     logger.info(f"Attempting to delete crafting recipe ID: {recipe_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return False
     try:
@@ -615,14 +702,14 @@ def delete_crafting_recipe(db_path: str, recipe_id: int) -> bool:
 
 # --- CRUD for BaseBlueprint ---
 def create_base_blueprint(
-    db_path: str, 
+    db_path: DbTarget, 
     name: str, 
     description: Optional[str] = None, 
     category: Optional[str] = None, 
     thumbnail_path: Optional[str] = None
 ) -> Optional[BaseBlueprint]:
     logger.info(f"Attempting to create base blueprint with name: {name}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         logger.error("Failed to create database connection.")
         return None
@@ -650,9 +737,9 @@ def create_base_blueprint(
         if conn:
             conn.close()
 
-def get_base_blueprint_by_id(db_path: str, blueprint_id: int) -> Optional[BaseBlueprint]:
+def get_base_blueprint_by_id(db_path: DbTarget, blueprint_id: int) -> Optional[BaseBlueprint]:
     logger.debug(f"Fetching base blueprint with ID: {blueprint_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -669,9 +756,9 @@ def get_base_blueprint_by_id(db_path: str, blueprint_id: int) -> Optional[BaseBl
         if conn:
             conn.close()
 
-def get_base_blueprint_by_name(db_path: str, name: str) -> Optional[BaseBlueprint]:
+def get_base_blueprint_by_name(db_path: DbTarget, name: str) -> Optional[BaseBlueprint]:
     logger.debug(f"Fetching base blueprint with name: {name}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -688,9 +775,9 @@ def get_base_blueprint_by_name(db_path: str, name: str) -> Optional[BaseBlueprin
         if conn:
             conn.close()
 
-def get_all_base_blueprints(db_path: str) -> List[BaseBlueprint]:
+def get_all_base_blueprints(db_path: DbTarget) -> List[BaseBlueprint]:
     logger.debug("Fetching all base blueprints")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return []
     try:
@@ -706,7 +793,7 @@ def get_all_base_blueprints(db_path: str) -> List[BaseBlueprint]:
             conn.close()
 
 def update_base_blueprint(
-    db_path: str, 
+    db_path: DbTarget, 
     blueprint_id: int, 
     name: Optional[str] = None,
     description: Optional[str] = None, 
@@ -714,7 +801,7 @@ def update_base_blueprint(
     thumbnail_path: Optional[str] = None
 ) -> Optional[BaseBlueprint]:
     logger.info(f"Attempting to update base blueprint with ID: {blueprint_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     
@@ -727,6 +814,7 @@ def update_base_blueprint(
             existing_bp = get_base_blueprint_by_name(db_path, name)
             if existing_bp:
                 logger.warning(f"Cannot update base blueprint ID {blueprint_id}: another blueprint with name '{name}' already exists (ID: {existing_bp.id}).")
+                conn.close()
                 return None
         fields_to_update.append("name = ?")
         params.append(name)
@@ -743,6 +831,7 @@ def update_base_blueprint(
 
     if not fields_to_update:
         logger.info("No fields provided to update for base blueprint.")
+        conn.close()
         return get_base_blueprint_by_id(db_path, blueprint_id)
 
     current_time = get_current_utc_timestamp()
@@ -768,9 +857,9 @@ def update_base_blueprint(
         if conn:
             conn.close()
 
-def delete_base_blueprint(db_path: str, blueprint_id: int) -> bool:
+def delete_base_blueprint(db_path: DbTarget, blueprint_id: int) -> bool:
     logger.info(f"Attempting to delete base blueprint with ID: {blueprint_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return False
     try:
@@ -791,14 +880,14 @@ def delete_base_blueprint(db_path: str, blueprint_id: int) -> bool:
 
 # --- CRUD for LoreEntry ---
 def create_lore_entry(
-    db_path: str, 
+    db_path: DbTarget, 
     title: str, 
     content_markdown: Optional[str] = None, 
     category: Optional[str] = None, 
     tags: Optional[str] = None # JSON string
 ) -> Optional[LoreEntry]:
     logger.info(f"Attempting to create lore entry with title: {title}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         logger.error("Failed to create database connection.")
         return None
@@ -826,9 +915,9 @@ def create_lore_entry(
         if conn:
             conn.close()
 
-def get_lore_entry_by_id(db_path: str, entry_id: int) -> Optional[LoreEntry]:
+def get_lore_entry_by_id(db_path: DbTarget, entry_id: int) -> Optional[LoreEntry]:
     logger.debug(f"Fetching lore entry with ID: {entry_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -845,9 +934,9 @@ def get_lore_entry_by_id(db_path: str, entry_id: int) -> Optional[LoreEntry]:
         if conn:
             conn.close()
 
-def get_lore_entry_by_title(db_path: str, title: str) -> Optional[LoreEntry]:
+def get_lore_entry_by_title(db_path: DbTarget, title: str) -> Optional[LoreEntry]:
     logger.debug(f"Fetching lore entry with title: {title}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     try:
@@ -864,9 +953,9 @@ def get_lore_entry_by_title(db_path: str, title: str) -> Optional[LoreEntry]:
         if conn:
             conn.close()
 
-def get_all_lore_entries(db_path: str) -> List[LoreEntry]:
+def get_all_lore_entries(db_path: DbTarget) -> List[LoreEntry]:
     logger.debug("Fetching all lore entries")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return []
     try:
@@ -882,7 +971,7 @@ def get_all_lore_entries(db_path: str) -> List[LoreEntry]:
             conn.close()
 
 def update_lore_entry(
-    db_path: str, 
+    db_path: DbTarget, 
     entry_id: int, 
     title: Optional[str] = None,
     content_markdown: Optional[str] = None, 
@@ -890,7 +979,7 @@ def update_lore_entry(
     tags: Optional[str] = None # JSON string
 ) -> Optional[LoreEntry]:
     logger.info(f"Attempting to update lore entry with ID: {entry_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return None
     
@@ -903,6 +992,7 @@ def update_lore_entry(
             existing_entry = get_lore_entry_by_title(db_path, title)
             if existing_entry:
                 logger.warning(f"Cannot update lore entry ID {entry_id}: another entry with title '{title}' already exists (ID: {existing_entry.id}).")
+                conn.close()
                 return None
         fields_to_update.append("title = ?")
         params.append(title)
@@ -919,6 +1009,7 @@ def update_lore_entry(
 
     if not fields_to_update:
         logger.info("No fields provided to update for lore entry.")
+        conn.close()
         return get_lore_entry_by_id(db_path, entry_id)
 
     current_time = get_current_utc_timestamp()
@@ -944,9 +1035,9 @@ def update_lore_entry(
         if conn:
             conn.close()
 
-def delete_lore_entry(db_path: str, entry_id: int) -> bool:
+def delete_lore_entry(db_path: DbTarget, entry_id: int) -> bool:
     logger.info(f"Attempting to delete lore entry with ID: {entry_id}")
-    conn = get_db_connection(db_path) 
+    conn = _connect(db_path) 
     if conn is None:
         return False
     try:
@@ -966,9 +1057,9 @@ def delete_lore_entry(db_path: str, entry_id: int) -> bool:
             conn.close()
 
 # --- CRUD for UserSetting ---
-def create_user_setting(db_path: str, setting_key: str, setting_value: Optional[str] = None) -> Optional[UserSetting]:
+def create_user_setting(db_path: DbTarget, setting_key: str, setting_value: Optional[str] = None) -> Optional[UserSetting]:
     logger.info(f"Attempting to create user setting with key: {setting_key}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         logger.error("Failed to create database connection.")
         return None
@@ -996,9 +1087,9 @@ def create_user_setting(db_path: str, setting_key: str, setting_value: Optional[
         if conn:
             conn.close()
 
-def get_user_setting_by_id(db_path: str, setting_id: int) -> Optional[UserSetting]:
+def get_user_setting_by_id(db_path: DbTarget, setting_id: int) -> Optional[UserSetting]:
     logger.debug(f"Fetching user setting with ID: {setting_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
     try:
@@ -1015,9 +1106,9 @@ def get_user_setting_by_id(db_path: str, setting_id: int) -> Optional[UserSettin
         if conn:
             conn.close()
 
-def get_user_setting_by_key(db_path: str, setting_key: str) -> Optional[UserSetting]:
+def get_user_setting_by_key(db_path: DbTarget, setting_key: str) -> Optional[UserSetting]:
     logger.debug(f"Fetching user setting with key: {setting_key}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
     try:
@@ -1034,9 +1125,9 @@ def get_user_setting_by_key(db_path: str, setting_key: str) -> Optional[UserSett
         if conn:
             conn.close()
 
-def get_all_user_settings(db_path: str) -> List[UserSetting]:
+def get_all_user_settings(db_path: DbTarget) -> List[UserSetting]:
     logger.debug("Fetching all user settings")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return []
     try:
@@ -1051,9 +1142,9 @@ def get_all_user_settings(db_path: str) -> List[UserSetting]:
         if conn:
             conn.close()
 
-def update_user_setting(db_path: str, setting_id: int, setting_key: Optional[str] = None, setting_value: Optional[str] = None) -> Optional[UserSetting]:
+def update_user_setting(db_path: DbTarget, setting_id: int, setting_key: Optional[str] = None, setting_value: Optional[str] = None) -> Optional[UserSetting]:
     logger.info(f"Attempting to update user setting with ID: {setting_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return None
     
@@ -1066,6 +1157,7 @@ def update_user_setting(db_path: str, setting_id: int, setting_key: Optional[str
             existing_setting = get_user_setting_by_key(db_path, setting_key)
             if existing_setting and existing_setting.id != setting_id: # Check if the found key belongs to a different setting
                 logger.warning(f"Cannot update user setting ID {setting_id}: another setting with key '{setting_key}' already exists (ID: {existing_setting.id}).")
+                conn.close()
                 return None
         fields_to_update.append("setting_key = ?")
         params.append(setting_key)
@@ -1087,6 +1179,7 @@ def update_user_setting(db_path: str, setting_id: int, setting_key: Optional[str
         # and `params` will contain `None`. This seems correct.
         existing_setting = get_user_setting_by_id(db_path, setting_id)
         if existing_setting and len(fields_to_update) == 0 : # only if truly no fields were specified for update
+             conn.close()
              return existing_setting
         # If fields_to_update is not empty, proceed with the update.
 
@@ -1118,9 +1211,9 @@ def update_user_setting(db_path: str, setting_id: int, setting_key: Optional[str
         if conn:
             conn.close()
 
-def delete_user_setting(db_path: str, setting_id: int) -> bool:
+def delete_user_setting(db_path: DbTarget, setting_id: int) -> bool:
     logger.info(f"Attempting to delete user setting with ID: {setting_id}")
-    conn = get_db_connection(db_path)
+    conn = _connect(db_path)
     if conn is None:
         return False
     try:
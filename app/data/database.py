@@ -1,6 +1,7 @@
 import sqlite3
 import os
-from typing import Optional, Dict # Added for type hinting
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator # Added for type hinting
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -186,22 +187,44 @@ def get_db_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
     """Establishes a connection to the SQLite database.
     Enables foreign key support for the connection.
     Args:
-        db_path (Optional[str]): Path to the database file. Uses default if None.
+        db_path (Optional[str]): Path to the database file, or an SQLite 'file:' URI. Uses default if None.
     Returns:
         sqlite3.Connection: A database connection object.
     """
     path_to_use = db_path if db_path else DEFAULT_DATABASE_PATH
-    
+    # SQLite URI filenames (e.g. 'file:name?mode=memory&cache=shared') need uri=True
+    is_uri = path_to_use.startswith('file:')
+
     # Ensure the directory for the database exists
-    if path_to_use != ':memory:': # Do not try to create dirs for in-memory DB
+    if path_to_use != ':memory:' and not is_uri: # Do not try to create dirs for in-memory DB or URIs
         os.makedirs(os.path.dirname(path_to_use), exist_ok=True)
-        
-    conn = sqlite3.connect(path_to_use)
+
+    conn = sqlite3.connect(path_to_use, uri=is_uri)
     conn.row_factory = sqlite3.Row  # Access columns by name
     conn.execute("PRAGMA foreign_keys = ON;") # Enforce foreign key constraints
     logger.info(f"Database connection established to {path_to_use}")
     return conn
 
+@contextmanager
+def db_session(db_path: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """Opens one connection for a block of work and closes it afterwards.
+    The block runs in a single transaction: committed if the block completes, rolled back if it raises.
+    The connection can be passed in place of db_path to the CRUD functions so they all share it;
+    their per-call savepoints nest inside this transaction instead of committing on their own.
+    Args:
+        db_path (Optional[str]): Path to the database file, or an SQLite 'file:' URI. Uses default if None.
+    """
+    conn = get_db_connection(db_path)
+    try:
+        conn.execute("BEGIN")
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
 def initialize_database(db_path: Optional[str] = None):
     """Initializes the database by creating tables if they don't already exist.
     Args:
@@ -45,7 +45,7 @@ class RecipeIngredient:
     # Optionally, store the resource name for convenience, though not in DB table
     resource_name: Optional[str] = None 
 
-@dataclass
+@dataclass(slots=True)
 class SkillTreeNode:
     id: Optional[int] = None
     name: str = ""
@@ -59,7 +59,7 @@ class SkillTreeNode:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class BaseBlueprint: # Simplified for MVP
     id: Optional[int] = None
     name: str = ""
@@ -3,7 +3,7 @@
 Import/Export Service for Dune Companion PC App.
 
 This module provides functionality to import and export data in various formats
-including JSON, Markdown, and CSV. It handles resources, crafting recipes,
+including JSON, JSON Lines, Markdown, and CSV. It handles resources, crafting recipes,
 and other game data for backup, sharing, and migration purposes.
 """
 
@@ -13,6 +13,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson # Optional: much faster JSON encoding; the stdlib encoder is used when it's missing
+except ImportError:
+    orjson = None
+
 from app.data.database import get_default_db_path
 from app.data.crud import (
     get_all_resources, get_all_crafting_recipes,
@@ -25,13 +30,40 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _orjson_dumps(obj: Any, indent: bool = False) -> Optional[bytes]:
+    """Encode obj with orjson, or return None so the caller falls back to the stdlib json module.
+
+    None is returned when orjson isn't installed or can't encode obj (non-str dict keys, ints
+    beyond 64 bits). Datetimes and dataclasses go through default=str, as with json. For the strings,
+    ints, bools and None that exports hold the output matches json's; floats may be spelled
+    differently (0.00001 vs 1e-05) and NaN/Infinity become null instead of json's non-standard NaN.
+    """
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(
+            obj, default=str,
+            option=(orjson.OPT_INDENT_2 if indent else 0) | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    except TypeError: # orjson.JSONEncodeError is a TypeError subclass
+        return None
+
+
+def _encode_json_line(obj: Any) -> bytes:
+    """Encode obj as one compact line of JSON (UTF-8, newline-terminated) for JSON Lines output."""
+    encoded = _orjson_dumps(obj)
+    if encoded is not None:
+        return encoded + b'\n'
+    return (json.dumps(obj, ensure_ascii=False, default=str, separators=(',', ':')) + '\n').encode('utf-8')
+
+
 class ImportExportService:
     """Service for importing and exporting Dune Companion data."""
-    supported_formats = ['json', 'markdown', 'csv']
+    supported_formats = ['json', 'jsonl', 'markdown', 'csv']
     
     def __init__(self, db_path: Optional[str] = None):
         """Initialize the import/export service."""
-        self.supported_export_formats = ['json', 'markdown', 'csv']
+        self.supported_export_formats = ['json', 'jsonl', 'markdown', 'csv']
         self.supported_import_formats = ['json', 'csv'] # Removed 'markdown'
         self.db_path = db_path or get_default_db_path()
         logger.info("Import/Export service initialized")
@@ -44,7 +76,7 @@ class ImportExportService:
         
         Args:
             export_path: Path where the exported data will be saved
-            format_type: Format to export ('json', 'markdown', 'csv')
+            format_type: Format to export ('json', 'jsonl', 'markdown', 'csv')
             
         Returns:
             bool: True if export was successful, False otherwise
@@ -58,6 +90,8 @@ class ImportExportService:
             
             if format_type == 'json':
                 return self._export_json(data, export_path)
+            elif format_type == 'jsonl':
+                return self._export_jsonl(data, export_path)
             elif format_type == 'markdown':
                 return self._export_markdown(data, export_path)
             elif format_type == 'csv':
@@ -77,6 +111,8 @@ class ImportExportService:
             
             if format_type == 'json':
                 return self._export_json(data, export_path)
+            elif format_type == 'jsonl':
+                return self._export_jsonl(data, export_path)
             elif format_type == 'csv':
                 return self._export_resources_csv(resources, export_path)
             elif format_type == 'markdown':
@@ -96,6 +132,8 @@ class ImportExportService:
             
             if format_type == 'json':
                 return self._export_json(data, export_path)
+            elif format_type == 'jsonl':
+                return self._export_jsonl(data, export_path)
             elif format_type == 'csv':
                 return self._export_recipes_csv(recipes, export_path)
             elif format_type == 'markdown':
@@ -340,8 +378,12 @@ class ImportExportService:
         try:
             export_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            encoded = _orjson_dumps(data, indent=True)
+            if encoded is not None:
+                export_path.write_bytes(encoded)
+            else:
+                with open(export_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
             
             logger.info(f"Data exported to JSON: {export_path}")
             return True
@@ -350,6 +392,28 @@ class ImportExportService:
             logger.error(f"Failed to export JSON: {e}")
             return False
     
+    def _export_jsonl(self, data: Dict[str, Any], export_path: Path) -> bool:
+        """Export data as a JSON Lines file, one record per line.
+
+        Each line is {"type": <section>, "record": <object>}: the metadata first (if present),
+        then one line per row of each list section, so readers can process the file row by row.
+        """
+        try:
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(export_path, 'wb', buffering=1024 * 1024) as f:
+                for section, value in data.items():
+                    rows = value if isinstance(value, list) else [value]
+                    for row in rows:
+                        f.write(_encode_json_line({'type': section, 'record': row}))
+            
+            logger.info(f"Data exported to JSON Lines: {export_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to export JSON Lines: {e}")
+            return False
+    
     def _import_json(self, import_path: Path, merge_strategy: str) -> bool:
         """Import data from JSON file."""
         try:
@@ -474,15 +538,11 @@ class ImportExportService:
         fieldnames = ['id', 'name', 'category', 'rarity', 'description', 'source_locations', 
                      'icon_path', 'discovered', 'created_at', 'updated_at']
         
-        # Filter data to only include fieldnames to avoid CSV writer issues
-        filtered_resources = []
-        for resource in resources:
-            filtered_resource = {field: resource.get(field, '') for field in fieldnames}
-            filtered_resources.append(filtered_resource)
         with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # DictWriter drops keys outside fieldnames and writes missing ones empty, so rows need no pre-filtering
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, restval='', extrasaction='ignore')
             writer.writeheader()
-            writer.writerows(filtered_resources)
+            writer.writerows(resources)
     
     def _write_recipes_csv(self, recipes: List[Dict], file_path: Path) -> None:
         """Write crafting recipes data to CSV file."""
@@ -490,16 +550,11 @@ class ImportExportService:
                      'crafting_time_seconds', 'required_station', 'skill_requirement', 
                      'icon_path', 'discovered', 'ingredients', 'created_at', 'updated_at']
         
-        # Filter data to only include fieldnames to avoid CSV writer issues
-        filtered_recipes = []
-        for recipe in recipes:
-            filtered_recipe = {field: recipe.get(field, '') for field in fieldnames}
-            filtered_recipes.append(filtered_recipe)
-        
         with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # DictWriter drops keys outside fieldnames and writes missing ones empty, so rows need no pre-filtering
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, restval='', extrasaction='ignore')
             writer.writeheader()
-            writer.writerows(filtered_recipes)
+            writer.writerows(recipes)
 
     def _export_resources_csv(self, resources: List[Resource], export_path: Path) -> bool:
         """Export resources as CSV file."""
@@ -73,8 +73,16 @@ def shutdown_logging():
     """
     global _managed_handlers
     for handler in _managed_handlers:
-        handler.flush() # Ensure all pending logs are written
-        handler.close()
+        # The underlying stream may already be closed (e.g. a captured stderr); logging.shutdown()
+        # ignores the same errors. close() gets its own try so a failed flush still releases the file.
+        try:
+            handler.flush() # Ensure all pending logs are written
+        except (OSError, ValueError):
+            pass
+        try:
+            handler.close()
+        except (OSError, ValueError):
+            pass
         logger.removeHandler(handler)
     _managed_handlers = [] # Clear the list of managed handlers
 
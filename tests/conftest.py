@@ -0,0 +1,12 @@
+import os
+
+from app.utils import logger as app_logger
+
+
+def pytest_configure(config):
+    """Under pytest-xdist, point each worker's app log at its own file so log rotation doesn't race across processes."""
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker:
+        app_logger.shutdown_logging()
+        app_logger.LOG_FILE = os.path.join(app_logger.LOGS_DIR, f'app.{worker}.log')
+        app_logger.initialize_handlers()
@@ -8,22 +8,39 @@ in various formats including JSON, Markdown, and CSV.
 
 import json
 import csv
-import tempfile
 import pytest
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 
+from app.services import import_export_service as ies
 from app.services.import_export_service import ImportExportService
+from app.data.models import Resource, CraftingRecipe
+
+
+def _row_object(model, data):
+    """Build a SimpleNamespace row for the mocked getters, without MagicMock overhead.
+
+    Fields missing from data take the model's defaults, and string timestamps are parsed to datetimes.
+    The real getters return model dataclasses with string timestamps instead.
+    """
+    row = {**asdict(model()), **data}
+    for key in ('created_at', 'updated_at'):
+        if isinstance(row[key], str):
+            row[key] = datetime.fromisoformat(row[key].replace('Z', '+00:00'))
+    return SimpleNamespace(**row)
 
 
 class TestExportFunctionality:
     """Test cases focused on export functionality."""
-    
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.service = ImportExportService()
-          # Create comprehensive test data
-        self.test_resources = [
+
+    @classmethod
+    def setup_class(cls):
+        """Build the shared test data once for the class; no test mutates it."""
+        # Create comprehensive test data
+        cls.test_resources = [
             {
                 'id': 1,
                 'name': 'Spice',
@@ -48,8 +65,8 @@ class TestExportFunctionality:
                 'created_at': '2025-06-08T10:30:00',
                 'updated_at': '2025-06-08T10:30:00'
             }        ]
-        
-        self.test_recipes = [
+
+        cls.test_recipes = [
             {
                 'id': 1,
                 'name': 'Stillsuit',
@@ -77,8 +94,15 @@ class TestExportFunctionality:
                 'updated_at': '2025-06-08T11:30:00'
             }
         ]
-    
-    def test_json_export_comprehensive(self):
+        # Attribute-object versions for mocked DB getters; timestamps are parsed here once, not per test
+        cls.resource_rows = [_row_object(Resource, data) for data in cls.test_resources]
+        cls.recipe_rows = [_row_object(CraftingRecipe, data) for data in cls.test_recipes]
+
+    def setup_method(self):
+        """Give each test its own service instance."""
+        self.service = ImportExportService()
+
+    def test_json_export_comprehensive(self, tmp_path):
         """Test comprehensive JSON export with all data types."""
         test_data = {
             'metadata': {
@@ -89,34 +113,74 @@ class TestExportFunctionality:
             'resources': self.test_resources,
             'crafting_recipes': self.test_recipes
         }
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            export_path = Path(temp_dir) / 'comprehensive_export.json'
-            
-            result = self.service._export_json(test_data, export_path)
-            
-            assert result is True
-            assert export_path.exists()
-            
-            # Verify exported content structure and data
-            with open(export_path, 'r', encoding='utf-8') as f:
-                exported_data = json.load(f)
-            
-            # Check metadata
-            assert 'metadata' in exported_data
-            assert exported_data['metadata']['app_version'] == '0.1.0'
-              # Check resources
-            assert len(exported_data['resources']) == 2
-            spice_resource = next(r for r in exported_data['resources'] if r['name'] == 'Spice')
-            assert spice_resource['rarity'] == 'Legendary'
-            assert spice_resource['source_locations'] == 'Arrakis Desert'
-              # Check crafting recipes
-            assert len(exported_data['crafting_recipes']) == 2
-            stillsuit_recipe = next(r for r in exported_data['crafting_recipes'] if r['name'] == 'Stillsuit')
-            assert stillsuit_recipe['category'] == 'Equipment'
-            assert stillsuit_recipe['crafting_time_seconds'] == 300
-    
-    def test_markdown_export_formatting(self):
+
+        export_path = tmp_path / 'comprehensive_export.json'
+
+        result = self.service._export_json(test_data, export_path)
+
+        assert result is True
+        assert export_path.exists()
+
+        # Verify exported content structure and data
+        exported_data = json.loads(export_path.read_bytes())
+
+        # Check metadata
+        assert 'metadata' in exported_data
+        assert exported_data['metadata']['app_version'] == '0.1.0'
+        # Check resources
+        assert len(exported_data['resources']) == 2
+        spice_resource = next(r for r in exported_data['resources'] if r['name'] == 'Spice')
+        assert spice_resource['rarity'] == 'Legendary'
+        assert spice_resource['source_locations'] == 'Arrakis Desert'
+        # Check crafting recipes
+        assert len(exported_data['crafting_recipes']) == 2
+        stillsuit_recipe = next(r for r in exported_data['crafting_recipes'] if r['name'] == 'Stillsuit')
+        assert stillsuit_recipe['category'] == 'Equipment'
+        assert stillsuit_recipe['crafting_time_seconds'] == 300
+
+    def test_jsonl_export_comprehensive(self, tmp_path):
+        """Test JSON Lines export writes the metadata and then one line per row, each readable alone."""
+        test_data = {
+            'metadata': {
+                'export_date': '2025-06-08T15:00:00',
+                'app_version': '0.1.0',
+                'format_version': '1.0'
+            },
+            'resources': self.test_resources,
+            'crafting_recipes': self.test_recipes
+        }
+
+        export_path = tmp_path / 'comprehensive_export.jsonl'
+
+        result = self.service._export_jsonl(test_data, export_path)
+
+        assert result is True
+        assert export_path.exists()
+
+        # Read back line by line, as a streaming consumer would
+        with open(export_path, 'rb') as f:
+            lines = [json.loads(line) for line in f]
+
+        assert [line['type'] for line in lines] == ['metadata', 'resources', 'resources', 'crafting_recipes', 'crafting_recipes']
+        assert lines[0]['record']['app_version'] == '0.1.0'
+        spice_resource = next(line['record'] for line in lines if line['type'] == 'resources' and line['record']['name'] == 'Spice')
+        assert spice_resource == self.test_resources[0]
+        stillsuit_recipe = next(line['record'] for line in lines if line['type'] == 'crafting_recipes' and line['record']['name'] == 'Stillsuit')
+        assert stillsuit_recipe['crafting_time_seconds'] == 300
+
+    def test_export_resources_jsonl(self, tmp_path, monkeypatch):
+        """Test export_resources routes 'jsonl' to the JSON Lines exporter."""
+        monkeypatch.setattr(ies, 'get_all_resources', lambda db_path: self.resource_rows)
+        export_path = tmp_path / 'resources.jsonl'
+
+        assert self.service.export_resources(export_path, 'jsonl') is True
+
+        with open(export_path, 'rb') as f:
+            lines = [json.loads(line) for line in f]
+        assert [line['type'] for line in lines] == ['resources', 'resources']
+        assert [line['record']['name'] for line in lines] == ['Spice', 'Water']
+
+    def test_markdown_export_formatting(self, tmp_path):
         """Test Markdown export with proper formatting and structure."""
         test_data = {
             'metadata': {
@@ -126,166 +190,137 @@ class TestExportFunctionality:
             'resources': self.test_resources,
             'crafting_recipes': self.test_recipes
         }
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            export_path = Path(temp_dir) / 'export.md'
-            
-            result = self.service._export_markdown(test_data, export_path)
-            
-            assert result is True
-            assert export_path.exists()
-            
-            # Read and verify content
-            with open(export_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-              # Check main structure
-            assert '# Dune Companion Data Export' in content
-            assert '**Export Date:** 2025-06-08T15:00:00' in content
-            assert '**App Version:** 0.1.0' in content
-            
-            # Check resources section
-            assert '## Resources' in content
-            assert '### Spice' in content
-            assert '- **Category:** Material' in content
-            assert '- **Rarity:** Legendary' in content
-            assert '- **Source Locations:** Arrakis Desert' in content
-            assert 'The spice must flow' in content
-            
-            assert '### Water' in content
-            assert '- **Category:** Resource' in content
-            assert '- **Rarity:** Common' in content
-            
-            # Check crafting recipes section
-            assert '## Crafting Recipes' in content
-            assert '### Stillsuit' in content
-            assert '- **Output:** 1x Stillsuit' in content
-            assert '- **Station:** Fabricator' in content
-            assert '- **Time:** 300 seconds' in content
-            assert '- **Description:** Advanced water recycling suit for desert survival' in content
-            
-            assert '### Thumper' in content
-            assert '- **Output:** 1x Thumper' in content
-            assert '- **Time:** 180 seconds' in content
-    
-    def test_csv_export_structure(self):
+
+        export_path = tmp_path / 'export.md'
+
+        result = self.service._export_markdown(test_data, export_path)
+
+        assert result is True
+        assert export_path.exists()
+
+        # Read and verify content
+        with open(export_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        # Check main structure
+        assert '# Dune Companion Data Export' in content
+        assert '**Export Date:** 2025-06-08T15:00:00' in content
+        assert '**App Version:** 0.1.0' in content
+
+        # Check resources section
+        assert '## Resources' in content
+        assert '### Spice' in content
+        assert '- **Category:** Material' in content
+        assert '- **Rarity:** Legendary' in content
+        assert '- **Source Locations:** Arrakis Desert' in content
+        assert 'The spice must flow' in content
+
+        assert '### Water' in content
+        assert '- **Category:** Resource' in content
+        assert '- **Rarity:** Common' in content
+
+        # Check crafting recipes section
+        assert '## Crafting Recipes' in content
+        assert '### Stillsuit' in content
+        assert '- **Output:** 1x Stillsuit' in content
+        assert '- **Station:** Fabricator' in content
+        assert '- **Time:** 300 seconds' in content
+        assert '- **Description:** Advanced water recycling suit for desert survival' in content
+
+        assert '### Thumper' in content
+        assert '- **Output:** 1x Thumper' in content
+        assert '- **Time:** 180 seconds' in content
+
+    def test_csv_export_structure(self, tmp_path):
         """Test CSV export creates proper directory structure and files."""
         test_data = {
             'resources': self.test_resources,
             'crafting_recipes': self.test_recipes
         }
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            export_path = Path(temp_dir) / 'csv_export.csv'
-            
-            result = self.service._export_csv(test_data, export_path)
-            
-            assert result is True
-            
-            # Check directory structure
-            csv_dir = export_path.with_suffix('')
-            assert csv_dir.exists()
-            assert csv_dir.is_dir()
-            
-            resources_csv = csv_dir / 'resources.csv'
-            recipes_csv = csv_dir / 'crafting_recipes.csv'
-            
-            assert resources_csv.exists()
-            assert recipes_csv.exists()
-              # Verify resources CSV content
-            with open(resources_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                
-                assert len(rows) == 2
-                spice_row = next(r for r in rows if r['name'] == 'Spice')
-                assert spice_row['category'] == 'Material'
-                assert spice_row['rarity'] == 'Legendary'
-                
-            # Verify recipes CSV content
-            with open(recipes_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                assert len(rows) == 2
-                stillsuit_row = next(r for r in rows if r['name'] == 'Stillsuit')
-                assert stillsuit_row['category'] == 'Equipment'
-                assert stillsuit_row['crafting_time_seconds'] == '300'
-    
+
+        export_path = tmp_path / 'csv_export.csv'
+
+        result = self.service._export_csv(test_data, export_path)
+
+        assert result is True
+
+        # Check directory structure
+        csv_dir = export_path.with_suffix('')
+        assert csv_dir.exists()
+        assert csv_dir.is_dir()
+
+        resources_csv = csv_dir / 'resources.csv'
+        recipes_csv = csv_dir / 'crafting_recipes.csv'
+
+        assert resources_csv.exists()
+        assert recipes_csv.exists()
+
+        # Verify resources CSV content
+        with open(resources_csv, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+
+            assert len(rows) == 2
+            spice_row = next(r for r in rows if r['name'] == 'Spice')
+            assert spice_row['category'] == 'Material'
+            assert spice_row['rarity'] == 'Legendary'
+
+        # Verify recipes CSV content
+        with open(recipes_csv, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            assert len(rows) == 2
+            stillsuit_row = next(r for r in rows if r['name'] == 'Stillsuit')
+            assert stillsuit_row['category'] == 'Equipment'
+            assert stillsuit_row['crafting_time_seconds'] == '300'
+
     @patch('app.services.import_export_service.get_all_resources')
     @patch('app.services.import_export_service.get_all_crafting_recipes')
-    def test_export_all_data_integration(self, mock_recipes, mock_resources):
+    def test_export_all_data_integration(self, mock_recipes, mock_resources, tmp_path):
         """Test complete export workflow with mocked database."""
-        from datetime import datetime
-        
-        # Mock database responses with proper datetime objects
-        mock_resource_objects = []
-        for resource_data in self.test_resources:
-            mock_resource = MagicMock()
-            for key, value in resource_data.items():
-                if key in ['created_at', 'updated_at'] and isinstance(value, str):
-                    # Convert string timestamps to datetime objects
-                    setattr(mock_resource, key, datetime.fromisoformat(value.replace('Z', '+00:00')))
-                else:
-                    setattr(mock_resource, key, value)
-            mock_resource_objects.append(mock_resource)
-        
-        mock_recipe_objects = []
-        for recipe_data in self.test_recipes:
-            mock_recipe = MagicMock()
-            for key, value in recipe_data.items():
-                if key in ['created_at', 'updated_at'] and isinstance(value, str):
-                    # Convert string timestamps to datetime objects
-                    setattr(mock_recipe, key, datetime.fromisoformat(value.replace('Z', '+00:00')))
-                else:
-                    setattr(mock_recipe, key, value)
-            mock_recipe_objects.append(mock_recipe)
-        
-        mock_resources.return_value = mock_resource_objects
-        mock_recipes.return_value = mock_recipe_objects
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            export_path = Path(temp_dir) / 'full_export.json'
-            
-            result = self.service.export_all_data(export_path, 'json')  # MODIFIED: Pass Path object directly
-            
-            assert result is True
-            assert export_path.exists()
-            
-            # Verify the exported data
-            with open(export_path, 'r', encoding='utf-8') as f:
-                exported_data = json.load(f)
-            
-            assert len(exported_data['resources']) == 2
-            assert len(exported_data['crafting_recipes']) == 2
-    
-    def test_export_empty_data(self):
+        # Mock database responses as plain attribute objects with proper datetime objects
+        mock_resources.return_value = self.resource_rows
+        mock_recipes.return_value = self.recipe_rows
+
+        export_path = tmp_path / 'full_export.json'
+
+        result = self.service.export_all_data(export_path, 'json')  # MODIFIED: Pass Path object directly
+
+        assert result is True
+        assert export_path.exists()
+
+        # Verify the exported data
+        exported_data = json.loads(export_path.read_bytes())
+
+        assert len(exported_data['resources']) == 2
+        assert len(exported_data['crafting_recipes']) == 2
+
+    def test_export_empty_data(self, tmp_path):
         """Test exporting when no data is available."""
         empty_data = {
             'metadata': {'export_date': '2025-06-08T15:00:00', 'app_version': '0.1.0'},
             'resources': [],
             'crafting_recipes': []
         }
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Test JSON export
-            json_path = Path(temp_dir) / 'empty.json'
-            result = self.service._export_json(empty_data, json_path)
-            assert result is True
-            
-            with open(json_path, 'r') as f:
-                data = json.load(f)
-            assert len(data['resources']) == 0
-            assert len(data['crafting_recipes']) == 0
-            
-            # Test Markdown export
-            md_path = Path(temp_dir) / 'empty.md'
-            result = self.service._export_markdown(empty_data, md_path)
-            assert result is True
-            
-            with open(md_path, 'r') as f:
-                content = f.read()
-            assert '# Dune Companion Data Export' in content
-    
-    def test_export_special_characters(self):
+
+        # Test JSON export
+        json_path = tmp_path / 'empty.json'
+        result = self.service._export_json(empty_data, json_path)
+        assert result is True
+
+        data = json.loads(json_path.read_bytes())
+        assert len(data['resources']) == 0
+        assert len(data['crafting_recipes']) == 0
+
+        # Test Markdown export
+        md_path = tmp_path / 'empty.md'
+        result = self.service._export_markdown(empty_data, md_path)
+        assert result is True
+
+        with open(md_path, 'r') as f:
+            content = f.read()
+        assert '# Dune Companion Data Export' in content
+
+    def test_export_special_characters(self, tmp_path):
         """Test exporting data with special characters and Unicode."""
         special_data = {
             'metadata': {'export_date': '2025-06-08T15:00:00', 'app_version': '0.1.0'},
@@ -301,43 +336,62 @@ class TestExportFunctionality:
             }],
             'crafting_recipes': []
         }
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Test JSON with Unicode
-            json_path = Path(temp_dir) / 'unicode.json'
-            result = self.service._export_json(special_data, json_path)
-            assert result is True
-            
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            assert 'Spice Mélange' in data['resources'][0]['name']
-            assert '🏜️' in data['resources'][0]['description']
-            
-            # Test Markdown with Unicode
-            md_path = Path(temp_dir) / 'unicode.md'
-            result = self.service._export_markdown(special_data, md_path)
-            assert result is True
-            
-            with open(md_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            assert 'Spice Mélange' in content
-            assert '🏜️' in content
-    
-    def test_export_error_handling(self):
+
+        # Test JSON with Unicode
+        json_path = tmp_path / 'unicode.json'
+        result = self.service._export_json(special_data, json_path)
+        assert result is True
+
+        data = json.loads(json_path.read_bytes())
+        assert 'Spice Mélange' in data['resources'][0]['name']
+        assert '🏜️' in data['resources'][0]['description']
+
+        # Test Markdown with Unicode
+        md_path = tmp_path / 'unicode.md'
+        result = self.service._export_markdown(special_data, md_path)
+        assert result is True
+
+        with open(md_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        assert 'Spice Mélange' in content
+        assert '🏜️' in content
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    def test_json_export_encoders(self, tmp_path, monkeypatch, use_orjson):
+        """Test JSON export with orjson and with the stdlib fallback, including values orjson can't encode."""
+        if not use_orjson:
+            monkeypatch.setattr(ies, 'orjson', None)
+        elif ies.orjson is None:
+            pytest.skip("orjson is not installed")
+
+        test_data = {
+            'metadata': {'export_date': '2025-06-08T15:00:00', 'app_version': '0.1.0'},
+            'resources': self.test_resources,
+            'crafting_recipes': self.test_recipes
+        }
+        export_path = tmp_path / 'encoders.json'
+        assert self.service._export_json(test_data, export_path) is True
+        assert json.loads(export_path.read_bytes()) == test_data
+
+        # Non-str keys and ints beyond 64 bits fall back to the stdlib encoder instead of failing
+        odd_data = {'metadata': {1: 'one', 'big': 2 ** 70}}
+        assert self.service._export_json(odd_data, export_path) is True
+        assert json.loads(export_path.read_bytes()) == {'metadata': {'1': 'one', 'big': 2 ** 70}}
+
+    def test_export_error_handling(self, tmp_path):
         """Test export error handling for various failure scenarios."""
         # Test with invalid path (read-only location)
         invalid_path = Path('/root/readonly/export.json')  # Typically read-only on Unix systems
         result = self.service._export_json({}, invalid_path)
         # Should handle gracefully (may return True on Windows, False on Unix)
         assert isinstance(result, bool)
-        
+
         # Test with malformed data
         malformed_data = {'resources': [{'name': None}]}  # Name is None
-        with tempfile.TemporaryDirectory() as temp_dir:
-            export_path = Path(temp_dir) / 'malformed.json'
-            # Should not crash, may succeed with None values
-            result = self.service._export_json(malformed_data, export_path)
-            assert isinstance(result, bool)
+        export_path = tmp_path / 'malformed.json'
+        # Should not crash, may succeed with None values
+        result = self.service._export_json(malformed_data, export_path)
+        assert isinstance(result, bool)
 
 
 if __name__ == '__main__':
@@ -222,7 +222,7 @@ class TestImportExportService:
 
     def test_service_initialization(self):
         """Test that the service initializes correctly."""
-        assert self.service.supported_export_formats == ['json', 'markdown', 'csv']
+        assert self.service.supported_export_formats == ['json', 'jsonl', 'markdown', 'csv']
         assert self.service.supported_import_formats == ['json', 'csv'] # Removed markdown
         assert isinstance(self.service, ImportExportService)
     
@@ -531,12 +531,12 @@ class TestImportExportService:
 class TestConvenienceFunctions:
     """Test the module-level convenience functions."""
 
-    @patch('app.services.import_export_service.ImportExportService.export_all_data') 
-    def test_export_all_data_function(self, mock_export_all_data):
+    def test_export_all_data_function(self, monkeypatch):
         """Test the export_all_data convenience function."""
         # This test now checks if the instance method is called correctly when a new service instance is created.
         # It doesn't test a standalone function anymore.
-        mock_export_all_data.return_value = True
+        mock_export_all_data = MagicMock(return_value=True)
+        monkeypatch.setattr(ImportExportService, 'export_all_data', mock_export_all_data)
         
         with tempfile.TemporaryDirectory() as temp_dir:
             export_path = Path(temp_dir) / 'test_export.json'
@@ -546,11 +546,11 @@ class TestConvenienceFunctions:
             assert result is True
             mock_export_all_data.assert_called_once_with(export_path, 'json')
     
-    @patch('app.services.import_export_service.ImportExportService.import_data') 
-    def test_import_data_function(self, mock_import_data):
+    def test_import_data_function(self, monkeypatch):
         """Test the import_data convenience function."""
         # Similar to the export test, this now checks the instance method.
-        mock_import_data.return_value = True
+        mock_import_data = MagicMock(return_value=True)
+        monkeypatch.setattr(ImportExportService, 'import_data', mock_import_data)
         
         with tempfile.TemporaryDirectory() as temp_dir:
             import_path = Path(temp_dir) / 'test_import.json'